@@ -1,12 +1,12 @@
-import re
 import unicodedata
+from functools import lru_cache
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query, Response
 from fastapi.responses import FileResponse
 
 from opds_server.core.config import Config, get_config
-from opds_server.db.access import get_book_file_path, get_book_title, get_cover_path
+from opds_server.db.access import get_book_download_info, get_cover_file
 from opds_server.services.opds import (
     generate_author_feed,
     generate_book_search_feed,
@@ -22,14 +22,22 @@ router = APIRouter()
 # Keep offset scans within a documented operational bound for every feed.
 MAX_PAGE_NUMBER = 10_000
 PageNumber = Annotated[int, Query(ge=1, le=MAX_PAGE_NUMBER)]
+# Opaque keyset position published in next links; see db.access.fetch_page.
+PageCursor = Annotated[str | None, Query(max_length=2048)]
 
+_FORBIDDEN_TABLE = str.maketrans({character: "_" for character in '\\/*?:"<>|'})
 
+
+@lru_cache(maxsize=2048)
 def title_to_filename(title: str, extension: str) -> str:
-    title = unicodedata.normalize("NFKD", title)
+    # ASCII titles are already in NFKD form.
+    if not title.isascii() and not unicodedata.is_normalized("NFKD", title):
+        title = unicodedata.normalize("NFKD", title)
 
-    title = re.sub(r'[\\/*?:"<>|]', "_", title)
+    title = title.translate(_FORBIDDEN_TABLE)
 
-    title = re.sub(r"\s+", " ", title).strip(" .")
+    # str.split() uses the same whitespace definition as the regex \s class.
+    title = " ".join(title.split()).strip(" .")
 
     if not title:
         title = "book"
@@ -43,67 +51,95 @@ def title_to_filename(title: str, extension: str) -> str:
 async def download_book(
     book_id: int, file_format: str, config: Config = Depends(get_config)
 ) -> FileResponse:
-    path = await get_book_file_path(book_id, file_format, config)
-    title = await get_book_title(book_id, config)
+    title, path, stat_result = await get_book_download_info(
+        book_id, file_format, config
+    )
+    extension = file_format.lower()
+    # Reuse the stat taken during path validation instead of letting the
+    # response stat the file again in a worker thread.
     return FileResponse(
         path,
-        media_type=get_book_mime_type(file_format.upper()),
-        filename=title_to_filename(title, extension=file_format.lower()),
+        stat_result=stat_result,
+        media_type=get_book_mime_type(extension),
+        filename=title_to_filename(title, extension=extension),
     )
 
 
 @router.get("/book/{book_id}/cover")
 async def get_cover(book_id: int, config: Config = Depends(get_config)) -> FileResponse:
-    path = await get_cover_path(book_id, config)
-    return FileResponse(path, media_type="image/jpeg")
+    path, stat_result = await get_cover_file(book_id, config)
+    return FileResponse(path, stat_result=stat_result, media_type="image/jpeg")
 
 
-@router.get("/opensearch.xml")
-def get_opensearch(config: Config = Depends(get_config)) -> Response:
-    """Return an OpenSearch document using the configured catalog path."""
-    search_template = config.opds_path("search")
-    osd = f"""<?xml version="1.0" encoding="UTF-8"?>
+OPENSEARCH_MEDIA_TYPE = "application/opensearchdescription+xml; charset=utf-8"
+
+
+@lru_cache(maxsize=8)
+def opensearch_document(search_template: str) -> bytes:
+    """Render the OpenSearch document for a search endpoint once."""
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
     <OpenSearchDescription xmlns="http://a9.com/-/spec/opensearch/1.1/">
       <ShortName>OPDS Search</ShortName>
       <Description>Search books in the OPDS catalog</Description>
       <Url type="application/atom+xml;profile=opds-catalog;kind=acquisition"
            template="{search_template}?q={{searchTerms}}"/>
     </OpenSearchDescription>
-    """
+    """.encode("utf-8")
+
+
+@router.get("/opensearch.xml")
+async def get_opensearch(config: Config = Depends(get_config)) -> Response:
+    """Return an OpenSearch document using the configured catalog path."""
     return Response(
-        content=osd, media_type="application/opensearchdescription+xml; charset=utf-8"
+        content=opensearch_document(config.opds_path("search")),
+        media_type=OPENSEARCH_MEDIA_TYPE,
     )
 
 
 @router.get("/search")
 async def search(
-    q: str, page: PageNumber = 1, config: Config = Depends(get_config)
+    q: str,
+    page: PageNumber = 1,
+    after: PageCursor = None,
+    config: Config = Depends(get_config),
 ) -> Response:
-    xml = await generate_book_search_feed(q, page, config)
+    xml = await generate_book_search_feed(q, page, config, after)
     return Response(content=xml, media_type="application/atom+xml; charset=utf-8")
 
 
 @router.get("/", response_class=Response)
-def root_main(config: Config = Depends(get_config)):
+async def root_main(config: Config = Depends(get_config)):
     xml = generate_root_feed(config)
     return Response(content=xml, media_type="application/atom+xml; charset=utf-8")
 
 
 @router.get("/by-newest", response_class=Response)
-async def root_by_newest(page: PageNumber = 1, config: Config = Depends(get_config)):
-    xml = await generate_newest_feed(page, config)
+async def root_by_newest(
+    page: PageNumber = 1,
+    after: PageCursor = None,
+    config: Config = Depends(get_config),
+):
+    xml = await generate_newest_feed(page, config, after)
     return Response(content=xml, media_type="application/atom+xml; charset=utf-8")
 
 
 @router.get("/by-title", response_class=Response)
-async def root_by_title(page: PageNumber = 1, config: Config = Depends(get_config)):
-    xml = await generate_title_feed(page, config)
+async def root_by_title(
+    page: PageNumber = 1,
+    after: PageCursor = None,
+    config: Config = Depends(get_config),
+):
+    xml = await generate_title_feed(page, config, after)
     return Response(content=xml, media_type="application/atom+xml; charset=utf-8")
 
 
 @router.get("/by-author")
-async def root_by_author(page: PageNumber = 1, config: Config = Depends(get_config)):
-    xml = await generate_by_author_feed(page, config)
+async def root_by_author(
+    page: PageNumber = 1,
+    after: PageCursor = None,
+    config: Config = Depends(get_config),
+):
+    xml = await generate_by_author_feed(page, config, after)
     return Response(content=xml, media_type="application/atom+xml; charset=utf-8")
 
 
@@ -111,7 +147,8 @@ async def root_by_author(page: PageNumber = 1, config: Config = Depends(get_conf
 async def get_author_books(
     author_id: int,
     page: PageNumber = 1,
+    after: PageCursor = None,
     config: Config = Depends(get_config),
 ):
-    xml = await generate_author_feed(author_id, page, config)
+    xml = await generate_author_feed(author_id, page, config, after)
     return Response(content=xml, media_type="application/atom+xml; charset=utf-8")
@@ -1,10 +1,21 @@
+import asyncio
+import base64
 import hashlib
+import json
 import logging
-from collections import defaultdict
-from contextlib import asynccontextmanager
+import math
+import os
+import sqlite3
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
 from datetime import UTC, datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import AsyncIterator
+from stat import S_ISREG
+from types import MappingProxyType
+from typing import AsyncIterator, Mapping
+from weakref import WeakKeyDictionary
 
 import aiosqlite
 from fastapi import HTTPException
@@ -16,6 +27,8 @@ log = logging.getLogger(__name__)
 CALIBRE_DATETIME_FALLBACK = datetime(1970, 1, 1, tzinfo=UTC)
 
 
+# Book pages are requested repeatedly, so their timestamps recur across requests.
+@lru_cache(maxsize=4096)
 def parse_calibre_datetime(value: object) -> datetime:
     """Parse a Calibre timestamp, falling back to a stable Atom-safe value."""
     if not isinstance(value, str) or not value.strip():
@@ -31,15 +44,25 @@ def parse_calibre_datetime(value: object) -> datetime:
     return parsed.astimezone(UTC)
 
 
-def _resolve_library_file(config: Config, *components: str) -> Path:
+@lru_cache(maxsize=8)
+def _library_root(library_path: Path) -> Path:
+    """Canonicalize a configured library root once it can be resolved.
+
+    Failures are not cached, so a library mounted after startup is still
+    found, while metadata.db itself is validated on every lookup.
+    """
+    return library_path.resolve(strict=True)
+
+
+def _stat_library_file(config: Config, *components: str) -> tuple[Path, os.stat_result]:
     """Resolve an existing regular file without leaving the Calibre library.
 
     Symlinks are followed so their final target, rather than only their
     visible path inside the library, is checked against the security
-    boundary.
+    boundary. The file's stat result is returned for reuse by responses.
     """
     # Resolve the root first so containment uses its canonical location.
-    root = config.calibre_library_path.resolve(strict=True)
+    root = _library_root(config.calibre_library_path)
     paths = [Path(component) for component in components]
 
     # Check raw database components before joining: absolute paths discard the
@@ -51,9 +74,15 @@ def _resolve_library_file(config: Config, *components: str) -> Path:
     # relative_to(), which raises when the final target is outside the root.
     candidate = root.joinpath(*paths).resolve(strict=True)
     candidate.relative_to(root)
-    if not candidate.is_file():
+    stat_result = candidate.stat()
+    if not S_ISREG(stat_result.st_mode):
         raise ValueError("Library path is not a file")
-    return candidate
+    return candidate, stat_result
+
+
+def _resolve_library_file(config: Config, *components: str) -> Path:
+    """Resolve a regular file inside the Calibre library."""
+    return _stat_library_file(config, *components)[0]
 
 
 def get_db_path(config: Config) -> Path:
@@ -67,29 +96,162 @@ def get_db_path(config: Config) -> Path:
         ) from None
 
 
-def get_db_uri(config: Config) -> str:
-    return f"file:{get_db_path(config)}?mode=ro"
+def get_db_uri(db_path: Path) -> str:
+    return f"file:{db_path}?mode=ro"
+
+
+@dataclass(slots=True)
+class SharedConnection:
+    """A read-only connection borrowed by concurrent requests."""
+
+    identity: tuple[int, int]
+    conn: aiosqlite.Connection
+    users: int = 0
+    retired: bool = False
+
+
+# Read-only connections shared by all requests, keyed by the canonical database
+# path. The file identity detects a replaced metadata.db, whose old handle
+# would otherwise keep serving the unlinked file.
+_connections: dict[Path, SharedConnection] = {}
+
+
+# Long-lived connections keep their page cache between requests, so give it
+# room and let SQLite read pages through a memory map. WAL cannot be enabled
+# because the library is opened read-only.
+CONNECTION_PRAGMAS = """
+PRAGMA query_only = 1;
+PRAGMA cache_size = -65536;
+PRAGMA mmap_size = 1073741824;
+PRAGMA temp_store = MEMORY;
+"""
+
+
+async def _open_connection(db_path: Path) -> aiosqlite.Connection:
+    conn = aiosqlite.connect(get_db_uri(db_path), uri=True)
+    # Cached connections outlive requests, so their worker threads must not
+    # keep the interpreter alive when the application is not shut down.
+    conn.daemon = True
+    await conn
+    try:
+        await conn.executescript(CONNECTION_PRAGMAS)
+    except aiosqlite.Error:
+        await conn.close()
+        raise
+    return conn
+
+
+async def _acquire_connection(db_path: Path) -> SharedConnection:
+    """Borrow the cached connection for a database file, opening it once."""
+    try:
+        stat = db_path.stat()
+    except OSError:
+        if (cached := _connections.get(db_path)) is not None:
+            await _retire_connection(db_path, cached)
+        # Report a file that vanished after validation like SQLite would.
+        raise aiosqlite.OperationalError("unable to open database file") from None
+    identity = (stat.st_dev, stat.st_ino)
+
+    # Look again after every await: another request may have opened, replaced
+    # or retired the connection meanwhile.
+    while True:
+        cached = _connections.get(db_path)
+        if cached is not None and cached.identity == identity:
+            if _is_closed(cached.conn):
+                await _retire_connection(db_path, cached)
+                continue
+            cached.users += 1
+            return cached
+        if cached is not None:
+            await _retire_connection(db_path, cached)
+            continue
+        conn = await _open_connection(db_path)
+        if db_path not in _connections:
+            shared = SharedConnection(identity, conn, users=1)
+            _connections[db_path] = shared
+            return shared
+        await conn.close()
+
+
+async def _retire_connection(db_path: Path, shared: SharedConnection) -> None:
+    """Stop handing out a connection and close it once its users are done."""
+    if _connections.get(db_path) is shared:
+        del _connections[db_path]
+    shared.retired = True
+    if shared.users == 0:
+        with suppress(aiosqlite.Error):
+            await shared.conn.close()
+
+
+async def _release_connection(shared: SharedConnection) -> None:
+    shared.users -= 1
+    if shared.retired and shared.users == 0:
+        with suppress(aiosqlite.Error):
+            await shared.conn.close()
+
+
+# Errors that leave the connection itself unusable. Statement failures such as
+# SQLITE_BUSY while Calibre writes are retried on the same connection.
+CONNECTION_FAILURES = frozenset(
+    {
+        sqlite3.SQLITE_CANTOPEN,
+        sqlite3.SQLITE_CORRUPT,
+        sqlite3.SQLITE_IOERR,
+        sqlite3.SQLITE_NOTADB,
+        sqlite3.SQLITE_READONLY,
+    }
+)
+
+
+def _is_connection_failure(exc: Exception) -> bool:
+    error_code = getattr(exc, "sqlite_errorcode", None)
+    return error_code is not None and error_code & 0xFF in CONNECTION_FAILURES
+
+
+def _is_closed(conn: aiosqlite.Connection) -> bool:
+    """Check whether aiosqlite has shut the connection down.
+
+    aiosqlite has no public flag for this; these are the attributes its
+    0.21 releases clear on close, and pyproject pins it below 0.22.
+    """
+    return not conn._running or conn._connection is None
+
+
+async def close_connections() -> None:
+    """Close every cached database connection."""
+    while _connections:
+        _, shared = _connections.popitem()
+        with suppress(aiosqlite.Error):
+            await shared.conn.close()
 
 
 @asynccontextmanager
 async def connect_db(config: Config) -> AsyncIterator[aiosqlite.Connection]:
-    """Open the configured Calibre database read-only."""
+    """Borrow the shared read-only connection to the configured database."""
+    db_path = get_db_path(config)
+    shared = None
     try:
-        conn = await aiosqlite.connect(
-            get_db_uri(config),
-            uri=True,
-        )
-        try:
-            yield conn
-        finally:
-            await conn.close()
-    except aiosqlite.Error as exc:
+        shared = await _acquire_connection(db_path)
+        yield shared.conn
+    except (aiosqlite.Error, ValueError) as exc:
+        # aiosqlite raises ValueError for a closed connection; any other
+        # ValueError is not a database failure.
+        closed = shared is not None and _is_closed(shared.conn)
+        if isinstance(exc, ValueError) and not closed:
+            raise
+        # Only a broken connection is replaced; requests still using it finish
+        # before it is closed.
+        if shared is not None and (closed or _is_connection_failure(exc)):
+            await _retire_connection(db_path, shared)
         # Database diagnostics belong in server logs; clients receive a stable,
         # non-sensitive response for connection, query, and close failures.
         log.warning("Calibre database unavailable: %s", type(exc).__name__)
         raise HTTPException(
             status_code=503, detail="Calibre database unavailable"
         ) from None
+    finally:
+        if shared is not None:
+            await _release_connection(shared)
 
 
 async def check_library_availability(config: Config) -> None:
@@ -101,53 +263,34 @@ async def check_library_availability(config: Config) -> None:
             await cursor.fetchone()
 
 
-async def get_book_title(book_id: int, config: Config) -> str:
-    async with connect_db(config) as conn:
-        async with conn.execute(
-            "SELECT title FROM books WHERE id=?", (book_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            if not row:
-                raise HTTPException(status_code=404, detail="Book not found")
-            return row[0]
-
-
-async def get_book_file_path(book_id: int, book_format: str, config: Config) -> Path:
-    """Get the absolute path to the book file in the specified format."""
+async def get_book_download_info(
+    book_id: int, book_format: str, config: Config
+) -> tuple[str, Path, os.stat_result]:
+    """Get the title, absolute file path and stat result of a book file."""
     book_format = book_format.upper().strip()
     async with connect_db(config) as conn:
-        # Fetch the folder path for the book
         async with conn.execute(
-            "SELECT path FROM books WHERE id=?", (book_id,)
-        ) as cursor:
-            book_row = await cursor.fetchone()
-
-        if not book_row:
-            log.debug(
-                "Book file not found for book_id=%s with format=%s",
-                book_id,
-                book_format,
-            )
-            raise HTTPException(status_code=404, detail="Book file not found")
-        folder = book_row[0]
-
-        # Fetch the format and filename for the book
-        async with conn.execute(
-            "SELECT name FROM data WHERE book = ? AND format = ?",
+            """
+            SELECT b.title, b.path, d.name
+            FROM books b
+            JOIN data d ON d.book = b.id
+            WHERE b.id = ? AND d.format = ?
+            """,
             (book_id, book_format),
         ) as cursor:
-            file_row = await cursor.fetchone()
-        if not file_row:
-            log.debug(
-                "Book file not found for book_id=%s with format=%s",
-                book_id,
-                book_format,
-            )
-            raise HTTPException(status_code=404, detail="Book file not found")
-    filename = file_row[0] + "." + book_format.lower()
+            row = await cursor.fetchone()
+    if not row:
+        log.debug(
+            "Book file not found for book_id=%s with format=%s",
+            book_id,
+            book_format,
+        )
+        raise HTTPException(status_code=404, detail="Book file not found")
+    title, folder, name = row
+    filename = name + "." + book_format.lower()
 
     try:
-        return _resolve_library_file(config, folder, filename)
+        return title, *_stat_library_file(config, folder, filename)
     except (OSError, ValueError):
         log.debug(
             "Book file target rejected for book_id=%s with format=%s",
@@ -157,14 +300,17 @@ async def get_book_file_path(book_id: int, book_format: str, config: Config) ->
         raise HTTPException(status_code=404, detail="Book file not found") from None
 
 
-def generate_book_id(title: str) -> str:
-    prefix = "calibre-navcatalog"
-    title_bytes = title.strip().encode("utf-8")
-    digest = hashlib.sha1(title_bytes).hexdigest()
-    return f"{prefix}:{digest}"
+@lru_cache(maxsize=16384)
+def generate_book_id(book_id: int) -> str:
+    # The digest only derives a stable Atom ID, so OpenSSL's FIPS checks for
+    # security-relevant hashing are unnecessary.
+    id_bytes = str(book_id).encode("utf-8")
+    digest = hashlib.sha1(id_bytes, usedforsecurity=False).hexdigest()
+    return "calibre-navcatalog:" + digest
 
 
-async def get_cover_path(book_id: int, config: Config) -> Path:
+async def get_cover_file(book_id: int, config: Config) -> tuple[Path, os.stat_result]:
+    """Get the absolute path and stat result of a book's cover image."""
     async with connect_db(config) as conn:
         async with conn.execute(
             "SELECT path FROM books WHERE id=?", (book_id,)
@@ -176,7 +322,7 @@ async def get_cover_path(book_id: int, config: Config) -> Path:
 
     folder = row[0]
     try:
-        return _resolve_library_file(config, folder, "cover.jpg")
+        return _stat_library_file(config, folder, "cover.jpg")
     except (OSError, ValueError):
         log.debug("Cover target rejected for book_id=%s", book_id)
         raise HTTPException(status_code=404, detail="Cover not found") from None
@@ -193,24 +339,114 @@ async def get_author_name(author_id: int, config: Config) -> str:
     return row[0]
 
 
-async def add_authors(books: list, config: Config) -> dict[int, dict]:
+async def get_data_version(conn: aiosqlite.Connection) -> int:
+    """Return a value that changes whenever another connection commits."""
+    async with conn.execute("PRAGMA data_version") as cursor:
+        (data_version,) = await cursor.fetchone()
+    return data_version
+
+
+# Libraries up to this many books keep every book's authors and files in memory.
+PREFETCH_MAX_BOOKS = 20_000
+
+# Authors and files of every book, keyed by the connection they were read
+# through. Each entry records the connection's data_version, which changes
+# whenever Calibre commits, and holds None for libraries too large to prefetch.
+BookLinks = tuple[dict[int, list[dict]], dict[int, list[dict]]]
+_book_links: WeakKeyDictionary[aiosqlite.Connection, tuple[int, BookLinks | None]] = (
+    WeakKeyDictionary()
+)
+# Reload locks per connection and event loop. Cached connections outlive the
+# loop that opened them, while an asyncio.Lock binds to a single loop.
+_book_link_locks: WeakKeyDictionary[
+    aiosqlite.Connection,
+    WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock],
+] = WeakKeyDictionary()
+
+
+def _book_link_lock(conn: aiosqlite.Connection) -> asyncio.Lock:
+    locks = _book_link_locks.get(conn)
+    if locks is None:
+        locks = _book_link_locks[conn] = WeakKeyDictionary()
+    loop = asyncio.get_running_loop()
+    lock = locks.get(loop)
+    if lock is None:
+        lock = locks[loop] = asyncio.Lock()
+    return lock
+
+
+async def prefetch_book_links(conn: aiosqlite.Connection) -> BookLinks | None:
+    """Return the authors and files of every book in a small library.
+
+    The maps are reloaded after the library changes. None means the library
+    is too large, and lookups should be limited to the current page.
+    """
+    data_version = await get_data_version(conn)
+    cached = _book_links.get(conn)
+    if cached is not None and cached[0] == data_version:
+        return cached[1]
+
+    # Requests that see the same commit wait for one reload instead of each
+    # scanning the link tables.
+    async with _book_link_lock(conn):
+        data_version = await get_data_version(conn)
+        cached = _book_links.get(conn)
+        if cached is not None and cached[0] == data_version:
+            return cached[1]
+        book_links = await _load_book_links(conn)
+        _book_links[conn] = (data_version, book_links)
+    return book_links
+
+
+async def _load_book_links(conn: aiosqlite.Connection) -> BookLinks | None:
+    async with conn.execute("SELECT count(*) FROM books") as cursor:
+        (book_count,) = await cursor.fetchone()
+    book_links = None
+    if book_count <= PREFETCH_MAX_BOOKS:
+        authors_by_book = defaultdict(list)
+        authors = {}
+        async with conn.execute(
+            """
+            SELECT bal.book, a.id, a.name
+            FROM books_authors_link bal
+            JOIN authors a ON bal.author = a.id
+            """
+        ) as cursor:
+            async for book_id, author_id, name in cursor:
+                # Share one record per author across all of their books.
+                author = authors.setdefault(author_id, {"id": author_id, "name": name})
+                authors_by_book[book_id].append(author)
+
+        files_by_book = defaultdict(list)
+        async with conn.execute("SELECT book, format, name FROM data") as cursor:
+            async for book_id, file_format, filename in cursor:
+                files_by_book[book_id].append({"format": file_format, "name": filename})
+        book_links = (dict(authors_by_book), dict(files_by_book))
+    return book_links
+
+
+# Book IDs are bound as one JSON array so the statement text stays constant and
+# SQLite's statement cache can reuse the prepared query for every page.
+async def add_authors(
+    books: list, conn: aiosqlite.Connection, book_links: BookLinks | None = None
+) -> dict[int, dict]:
     """Add authors to the books dictionary."""
     if not books:
         return {}
 
-    book_ids = [book[0] for book in books]
-    authors_by_book = defaultdict(list)
-    placeholders = ",".join("?" * len(book_ids))
-
-    async with connect_db(config) as conn:
+    if book_links is not None:
+        authors_by_book = book_links[0]
+    else:
+        book_ids = [book[0] for book in books]
+        authors_by_book = defaultdict(list)
         async with conn.execute(
-            f"""
-        SELECT bal.book AS book_id, a.id, a.name
-        FROM books_authors_link bal
-        JOIN authors a ON bal.author = a.id
-        WHERE bal.book IN ({placeholders})
-        """,
-            book_ids,
+            """
+            SELECT bal.book AS book_id, a.id, a.name
+            FROM books_authors_link bal
+            JOIN authors a ON bal.author = a.id
+            WHERE bal.book IN (SELECT value FROM json_each(?))
+            """,
+            (json.dumps(book_ids),),
         ) as cursor:
             async for book_id, author_id, name in cursor:
                 authors_by_book[book_id].append({"id": author_id, "name": name})
@@ -219,29 +455,35 @@ async def add_authors(books: list, config: Config) -> dict[int, dict]:
     for book_id, title, last_modified in books:
         result[book_id] = {
             "title": title,
-            "last_modified": parse_calibre_datetime(last_modified),
-            "authors": authors_by_book[book_id],
+            # Parsed by the feed renderer, which is the only consumer.
+            "last_modified": last_modified,
+            "authors": authors_by_book.get(book_id, []),
         }
 
     return result
 
 
-async def add_files(books: dict[int, dict], config: Config) -> dict[int, dict]:
+async def add_files(
+    books: dict[int, dict],
+    conn: aiosqlite.Connection,
+    book_links: BookLinks | None = None,
+) -> dict[int, dict]:
     """Add files to the books dictionary."""
     if not books:
         return books
 
-    book_ids = list(books.keys())
-    files_by_book = defaultdict(list)
-    placeholders = ",".join("?" * len(book_ids))
-    async with connect_db(config) as conn:
+    if book_links is not None:
+        files_by_book = book_links[1]
+    else:
+        book_ids = list(books.keys())
+        files_by_book = defaultdict(list)
         async with conn.execute(
-            f"""
-        SELECT book, format, name
-        FROM data
-        WHERE book IN ({placeholders})
-        """,
-            book_ids,
+            """
+            SELECT book, format, name
+            FROM data
+            WHERE book IN (SELECT value FROM json_each(?))
+            """,
+            (json.dumps(book_ids),),
         ) as cursor:
             async for book_id, file_format, filename in cursor:
                 files_by_book[book_id].append({"format": file_format, "name": filename})
@@ -252,39 +494,163 @@ async def add_files(books: dict[int, dict], config: Config) -> dict[int, dict]:
     return books
 
 
-async def select_books(
-    sql: str, page: int, config: Config, parameters: list | None = None
-) -> tuple[dict[int, dict], bool, bool]:
-    """Select books with pagination."""
+def _encode_page_cursor(sort_key: object, row_id: int) -> str:
+    """Encode the ordering key of a page's last row as an opaque cursor."""
+    payload = json.dumps([sort_key, row_id], ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode().rstrip("=")
 
-    if page < 1:
-        raise HTTPException(status_code=400, detail="Page number must be >= 1")
 
-    sql_paged = f"{sql.rstrip()} LIMIT ? OFFSET ?"
+def _decode_page_cursor(cursor: str) -> tuple[str | int | float | None, int]:
+    """Decode a cursor produced by _encode_page_cursor."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_key, row_id = json.loads(payload)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid page cursor") from None
+    if (
+        not _is_sqlite_integer(row_id)
+        or not isinstance(sort_key, str | int | float | None)
+        or isinstance(sort_key, bool)
+        or (isinstance(sort_key, int) and not _is_sqlite_integer(sort_key))
+        or (isinstance(sort_key, float) and not math.isfinite(sort_key))
+    ):
+        raise HTTPException(status_code=400, detail="Invalid page cursor")
+    return sort_key, row_id
+
+
+def _is_sqlite_integer(value: object) -> bool:
+    """Check that a value binds as a signed 64-bit SQLite integer."""
+    return (
+        isinstance(value, int)
+        and not isinstance(value, bool)
+        and -(2**63) <= value < 2**63
+    )
+
+
+def _keyset_condition(after: str | None) -> tuple[str, list]:
+    """Build the predicate selecting rows ordered after a page cursor."""
+    if after is None:
+        return "1", []
+    sort_key, row_id = _decode_page_cursor(after)
+    if sort_key is None:
+        # NULL sort keys come first, so every non-NULL key is still ahead.
+        return "(sort_key IS NOT NULL OR id > ?)", [row_id]
+    # The redundant lower bound lets SQLite seek an index on the sort column.
+    return "sort_key >= ? AND (sort_key > ? OR id > ?)", [sort_key, sort_key, row_id]
+
+
+async def fetch_page(
+    conn: aiosqlite.Connection,
+    sql: str,
+    parameters: list,
+    page: int,
+    after: str | None,
+    limit: int,
+) -> tuple[list, bool, str | None]:
+    """Fetch one page of rows ordered by their sort key and ID.
+
+    The query must select ``id`` first and ``sort_key`` last, without an ORDER
+    BY clause; ``sort_key`` is dropped from the returned rows. Pages requested
+    with a cursor seek past the previous page instead of scanning an offset,
+    while ``page`` alone still addresses any page directly.
+    """
+    keyset, keyset_parameters = _keyset_condition(after)
+    offset = 0 if after is not None else (page - 1) * limit
+    async with conn.execute(
+        f"""
+        SELECT * FROM ({sql})
+        WHERE {keyset}
+        ORDER BY sort_key, id
+        LIMIT ? OFFSET ?
+        """,
+        [*parameters, *keyset_parameters, limit + 1, offset],
+    ) as cursor:
+        rows = await cursor.fetchall()
+
+    has_previous = page > 1 and bool(rows)
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = _encode_page_cursor(last[-1], last[0])
+
+    return [row[:-1] for row in rows[:limit]], has_previous, next_cursor
+
+
+# Recently served book pages, including search results, kept per connection
+# like the prefetched links and dropped as soon as the library changes.
+BOOK_PAGE_CACHE_SIZE = 256
+BookPage = tuple[Mapping[int, Mapping], bool, str | None]
+_book_pages: WeakKeyDictionary[
+    aiosqlite.Connection, tuple[int, OrderedDict[tuple, BookPage]]
+] = WeakKeyDictionary()
+
+
+def _freeze_books(books: dict[int, dict]) -> Mapping[int, Mapping]:
+    """Return a read-only view of a page; prefetched records are shared."""
+    return MappingProxyType(
+        {
+            book_id: MappingProxyType(
+                {
+                    **book,
+                    "authors": tuple(map(MappingProxyType, book["authors"])),
+                    "files": tuple(map(MappingProxyType, book["files"])),
+                }
+            )
+            for book_id, book in books.items()
+        }
+    )
 
-    limit = config.page_size
-    offset = (page - 1) * limit
 
-    async with connect_db(config) as conn:
-        async with conn.execute(
-            sql_paged, list(parameters or []) + [limit + 1, offset]
-        ) as cursor:
-            books = await cursor.fetchall()
+async def select_books(
+    sql: str,
+    page: int,
+    config: Config,
+    parameters: list | None = None,
+    after: str | None = None,
+) -> BookPage:
+    """Select books with pagination.
+
+    Pages are cached and shared between requests, so the returned books are
+    read-only: mappings are MappingProxyType views and author and file lists
+    are tuples.
+    """
 
-    has_next = len(books) > limit
-    has_previous = offset > 0 and bool(books)
+    if page < 1:
+        raise HTTPException(status_code=400, detail="Page number must be >= 1")
 
-    books_dict = await add_authors(books[:limit], config)
-    await add_files(books_dict, config)
+    parameters = list(parameters or [])
+    key = (sql, tuple(parameters), page, after, config.page_size)
+    # Run the page query and both metadata lookups on one borrowed connection.
+    async with connect_db(config) as conn:
+        data_version = await get_data_version(conn)
+        cached = _book_pages.get(conn)
+        if cached is None or cached[0] != data_version:
+            cached = (data_version, OrderedDict())
+            _book_pages[conn] = cached
+        pages = cached[1]
+        if key in pages:
+            pages.move_to_end(key)
+            return pages[key]
+
+        books, has_previous, next_cursor = await fetch_page(
+            conn, sql, parameters, page, after, config.page_size
+        )
+        book_links = await prefetch_book_links(conn)
+        books_dict = await add_authors(books, conn, book_links)
+        await add_files(books_dict, conn, book_links)
 
-    return books_dict, has_previous, has_next
+    pages[key] = _freeze_books(books_dict), has_previous, next_cursor
+    if len(pages) > BOOK_PAGE_CACHE_SIZE:
+        pages.popitem(last=False)
+    return pages[key]
 
 
 async def get_books(
     sort: str,
     page: int,
     config: Config,
-) -> tuple[dict[int, dict], bool, bool]:
+    after: str | None = None,
+) -> BookPage:
     """Return a deterministically ordered page of books."""
     if sort == "by_title":
         sort_field = "sort"
@@ -294,64 +660,58 @@ async def get_books(
         raise HTTPException(status_code=400, detail="Invalid sort parameter")
 
     sql = f"""
-          SELECT id, title, last_modified
+          SELECT id, title, last_modified, {sort_field} AS sort_key
           FROM books
-          ORDER BY {sort_field}, id
           """
 
-    return await select_books(sql, page, config)
+    return await select_books(sql, page, config, after=after)
 
 
-async def get_authors(page: int, config: Config) -> tuple[list, bool, bool]:
+async def get_authors(
+    page: int, config: Config, after: str | None = None
+) -> tuple[list, bool, str | None]:
     if page < 1:
         raise HTTPException(status_code=400, detail="Page must be >= 1")
 
     sql = """
-          SELECT id, name
+          SELECT id, name, sort AS sort_key
           FROM authors
-          ORDER BY sort, id
           """
 
-    limit = config.page_size
-    offset = (page - 1) * limit
     async with connect_db(config) as conn:
-        async with conn.execute(
-            f"{sql.rstrip()} LIMIT ? OFFSET ?", [limit + 1, offset]
-        ) as cursor:
-            authors = await cursor.fetchall()
-
-    has_next = len(authors) > limit
-    has_previous = offset > 0 and bool(authors)
-
-    return authors[:limit], has_previous, has_next
+        return await fetch_page(conn, sql, [], page, after, config.page_size)
 
 
 async def get_author_books(
     author_id: int,
     page: int,
     config: Config,
-) -> tuple[dict[int, dict], bool, bool]:
+    after: str | None = None,
+) -> BookPage:
     sql = """
-          SELECT b.id, b.title, b.last_modified
+          SELECT b.id, b.title, b.last_modified, b.sort AS sort_key
           FROM books b
                    JOIN books_authors_link bal ON b.id = bal.book
           WHERE bal.author = ?
-          ORDER BY b.sort, b.id
           """
 
-    return await select_books(sql, page, config, [author_id])
+    return await select_books(sql, page, config, [author_id], after)
 
 
 async def search_books(
     query: str,
     page: int,
     config: Config,
-) -> tuple[dict[int, dict], bool, bool]:
+    after: str | None = None,
+) -> BookPage:
+    # Substring search scans titles; the scan is served from the cached
+    # connection's page cache. An FTS index would have to be written into the
+    # read-only library and kept in sync with Calibre, and would change the
+    # substring and wildcard semantics readers rely on.
     sql = """
-          SELECT id, title, last_modified
+          SELECT id, title, last_modified, sort AS sort_key
           FROM books
           WHERE title LIKE ? COLLATE NOCASE
-          ORDER BY sort, id
           """
 
-    return await select_books(sql, page, config, [f"%{query}%"])
+    return await select_books(sql, page, config, [f"%{query}%"], after)
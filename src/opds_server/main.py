@@ -8,7 +8,9 @@ from starlette.responses import PlainTextResponse, RedirectResponse
 
 from opds_server.api import catalog
 from opds_server.core.config import Config, get_config
-from opds_server.db.access import check_library_availability
+from opds_server.db.access import check_library_availability, close_connections
+
+log = logging.getLogger("uvicorn.error")
 
 
 def _get_version(pkg: str) -> str:
@@ -18,10 +20,22 @@ def _get_version(pkg: str) -> str:
         return "0.0.0"
 
 
+async def http_exception_handler(_, exc: HTTPException):
+    """Handle HTTP exceptions and log server errors."""
+    if exc.status_code >= 500:
+        log.exception(f"HTTP {exc.status_code}: {exc.detail}")
+    return PlainTextResponse(exc.detail, status_code=exc.status_code)
+
+
+async def general_exception_handler(_, exc: Exception):
+    """Handle unexpected exceptions and log them."""
+    log.exception("Unexpected error", exc_info=exc)
+    return PlainTextResponse("Internal Server Error", status_code=500)
+
+
 def create_app(config: Config | None = None) -> FastAPI:
     """Create an application using one consistent configuration instance."""
     app_config = config or get_config()
-    log = logging.getLogger("uvicorn.error")
 
     @asynccontextmanager
     async def lifespan(_: FastAPI) -> AsyncIterator[None]:
@@ -33,6 +47,7 @@ def create_app(config: Config | None = None) -> FastAPI:
                 raise
             log.warning("Starting with Calibre database unavailable")
         yield
+        await close_connections()
 
     package_version = _get_version(app_config.package_name)
     app = FastAPI(
@@ -43,7 +58,7 @@ def create_app(config: Config | None = None) -> FastAPI:
 
     if config is not None:
 
-        def get_supplied_config() -> Config:
+        async def get_supplied_config() -> Config:
             """Provide the configuration supplied to the application
             factory."""
             return app_config
@@ -57,12 +72,12 @@ def create_app(config: Config | None = None) -> FastAPI:
     if app_config.opds_prefix != "/":
 
         @app.get("/", include_in_schema=False)
-        def root_redirect():
+        async def root_redirect():
             """Redirect root URL to the configured OPDS feed."""
             return RedirectResponse(url=app_config.opds_prefix, status_code=307)
 
     @app.get("/healthz", tags=["_service"], include_in_schema=False)
-    def healthz() -> PlainTextResponse:
+    async def healthz() -> PlainTextResponse:
         """Liveness probe endpoint."""
         return PlainTextResponse("ok")
 
@@ -72,18 +87,8 @@ def create_app(config: Config | None = None) -> FastAPI:
         await check_library_availability(app_config)
         return PlainTextResponse("ok")
 
-    @app.exception_handler(HTTPException)
-    def http_exception_handler(_, exc: HTTPException):
-        """Handle HTTP exceptions and log server errors."""
-        if exc.status_code >= 500:
-            log.exception(f"HTTP {exc.status_code}: {exc.detail}")
-        return PlainTextResponse(exc.detail, status_code=exc.status_code)
-
-    @app.exception_handler(Exception)
-    def general_exception_handler(_, exc: Exception):
-        """Handle unexpected exceptions and log them."""
-        log.exception("Unexpected error", exc_info=exc)
-        return PlainTextResponse("Internal Server Error", status_code=500)
+    app.add_exception_handler(HTTPException, http_exception_handler)
+    app.add_exception_handler(Exception, general_exception_handler)
 
     return app
 
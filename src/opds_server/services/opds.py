@@ -1,6 +1,10 @@
 import html
+import time
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
+from types import MappingProxyType
 from urllib.parse import urlencode
 
 from opds_server.core.config import Config
@@ -10,23 +14,24 @@ from opds_server.db.access import (
     get_author_name,
     get_authors,
     get_books,
+    parse_calibre_datetime,
     search_books,
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     title: str
     id: str
     updated_time: datetime
     links: str
     db_id: int = -1
-    author: dict = field(default_factory=dict)
-    files: list[dict] = field(default_factory=list)
+    author: Mapping = field(default_factory=dict)
+    files: Sequence[Mapping] = field(default_factory=list)
     summary: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Feed:
     title: str
     id: str
@@ -37,143 +42,191 @@ class Feed:
     kind: str = "acquisition"
     page: int = 1
     previous: bool = False
-    next: bool = False
+    cursor: str | None = None
+    next_cursor: str | None = None
     parameters: dict = field(default_factory=dict)
 
 
-MIME_BY_EXT = {
-    "epub": "application/epub+zip",
-    "pdf": "application/pdf",
-    "mobi": "application/x-mobipocket-ebook",
-    "fb2": "application/x-fictionbook+xml",
-    "djvu": "image/vnd.djvu",
-    "azw3": "application/vnd.amazon.ebook",
-    "azw": "application/vnd.amazon.ebook",
-    "cbz": "application/x-cbz",
-    "cbr": "application/x-cbr",
-    "txt": "text/plain; charset=utf-8",
-    "rtf": "application/rtf",
-}
+MIME_BY_EXT = MappingProxyType(
+    {
+        "epub": "application/epub+zip",
+        "pdf": "application/pdf",
+        "mobi": "application/x-mobipocket-ebook",
+        "fb2": "application/x-fictionbook+xml",
+        "djvu": "image/vnd.djvu",
+        "azw3": "application/vnd.amazon.ebook",
+        "azw": "application/vnd.amazon.ebook",
+        "cbz": "application/x-cbz",
+        "cbr": "application/x-cbr",
+        "txt": "text/plain; charset=utf-8",
+        "rtf": "application/rtf",
+    }
+)
 
 
 def xml_text(s: str | int) -> str:
     """Escape text for safe placement into XML text nodes/attributes."""
-    return html.escape(str(s), quote=True)
+    if not isinstance(s, str):
+        s = str(s)
+    return html.escape(s, quote=True)
+
+
+# Atom timestamps have one-second precision, so feeds rendered within the same
+# second share one datetime. That also keeps the current time to one fmt_dt
+# cache entry per second instead of one per request.
+_coarse_now: tuple[float, datetime] = (float("-inf"), datetime.now(timezone.utc))
+
+
+def utc_now() -> datetime:
+    """Return the current UTC time, refreshed at most once per second."""
+    global _coarse_now
+    refreshed_at, now = _coarse_now
+    monotonic = time.monotonic()
+    if monotonic - refreshed_at >= 1.0:
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        _coarse_now = (monotonic, now)
+    return now
 
 
+@lru_cache(maxsize=4096)
 def fmt_dt(dt: datetime) -> str:
-    """Format datetime as Atom-compliant UTC timestamp."""
-    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    """Format datetime as Atom-compliant UTC timestamp.
 
+    Book timestamps repeat across requests, so formatted values are cached.
+    Years are zero-padded as RFC 3339 requires, unlike strftime's %Y.
+    """
+    if dt.tzinfo is not timezone.utc:
+        dt = dt.astimezone(timezone.utc)
+    return (
+        f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+        f"T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}Z"
+    )
 
+
+@lru_cache(maxsize=64)
 def get_book_mime_type(extension: str) -> str:
-    """Returns the MIME type for a given file extension.
+    """Returns the MIME type for a given lowercase file extension.
 
     If the extension is not recognized, returns 'application/octet-
     stream'.
     """
-    return MIME_BY_EXT.get(extension.lower(), "application/octet-stream")
+    return MIME_BY_EXT.get(extension, "application/octet-stream")
 
 
 def q(params: dict) -> str:
     """Build escaped query tail like '&amp;a=1&amp;b=2' or '' if no params."""
     if not params:
         return ""
-    return "&amp;" + urlencode(params, doseq=True)
+    return "&amp;" + xml_text(urlencode(params, doseq=True))
+
 
+def nav_link(rel: str, endpoint: str, page: int, query: str, kind: str) -> str:
+    """Uniform OPDS navigation link with profile type.
 
-def nav_link(rel: str, endpoint: str, page: int, params: dict, kind: str) -> str:
-    """Uniform OPDS navigation link with profile type."""
+    The endpoint is already escaped, and the query is an escaped tail as built
+    by q().
+    """
     return (
-        f'        <link rel="{rel}" href="{xml_text(endpoint)}?page={page}{q(params)}" '
+        f'        <link rel="{rel}" href="{endpoint}?page={page}{query}" '
         f'type="application/atom+xml;profile=opds-catalog;kind={kind}"/>'
     )
 
 
-def get_search_link(config: Config) -> str:
-    """Build the OpenSearch discovery link for the configured catalog."""
-    href = xml_text(config.opds_path("opensearch.xml"))
-    return f'        <link type="application/opensearchdescription+xml" rel="search" title="Search" href="{href}"/>'
-
+@lru_cache(maxsize=8)
+def get_search_link(href: str) -> str:
+    """Build the OpenSearch discovery link, once per catalog mount."""
+    return f'        <link type="application/opensearchdescription+xml" rel="search" title="Search" href="{xml_text(href)}"/>'
 
-def get_start_link(config: Config) -> str:
-    """Build the start link for the configured catalog."""
-    href = xml_text(config.opds_path())
-    return f'        <link rel="start" href="{href}" type="application/atom+xml;profile=opds-catalog;kind=navigation"/>'
 
+@lru_cache(maxsize=8)
+def get_start_link(href: str) -> str:
+    """Build the start link, once per catalog mount."""
+    return f'        <link rel="start" href="{xml_text(href)}" type="application/atom+xml;profile=opds-catalog;kind=navigation"/>'
 
-def get_author_xml(author: dict, config: Config) -> str:
-    if author:
-        name = xml_text(author["name"])
-        aid = xml_text(author.get("id", ""))
-        parts = [
-            "<author>",
-            f"{16 * ' '}<name>{name}</name>",
-        ]
-        if aid:
-            uri = xml_text(config.opds_path(f"author/{aid}"))
-            parts.append(f"{16 * ' '}<uri>{uri}</uri>")
-        parts.append(f"{12 * ' '}</author>")
 
-        return "\n".join(parts)
-    else:
+def get_author_xml(author: Mapping, config: Config) -> str:
+    if not author:
         return ""
+    return render_author(
+        author["name"], author.get("id", ""), config.opds_path("author")
+    )
+
+
+@lru_cache(maxsize=4096)
+def render_author(name: str, author_id: int | str, authors_path: str) -> str:
+    """Render an entry's author element; authors recur across many books."""
+    uri = ""
+    if aid := xml_text(author_id):
+        uri = f"\n                <uri>{xml_text(f'{authors_path}/{aid}')}</uri>"
+    return (
+        f"<author>\n                <name>{xml_text(name)}</name>"
+        f"{uri}\n            </author>"
+    )
 
 
-def get_files_xml(book_id: int, files: list[dict], config: Config) -> str:
+def get_files_xml(book_id: int, files: Sequence[Mapping], config: Config) -> str:
     if not files:
         return ""
 
-    files_xml = ""
+    parts = []
     for file in files:
         file_format = file["format"].lower()
-        files_xml += f"""
-            <link rel="http://opds-spec.org/acquisition" type="{get_book_mime_type(file_format)}" href="{xml_text(config.opds_path(f"book/{book_id}/file/{file_format}"))}"/>"""
-    return files_xml
+        parts.append(f"""
+            <link rel="http://opds-spec.org/acquisition" type="{get_book_mime_type(file_format)}" href="{xml_text(config.opds_path(f"book/{book_id}/file/{file_format}"))}"/>""")
+    return "".join(parts)
 
 
 def create_feed_links(feed: Feed, config: Config) -> str:
+    # Only self and next links carry a cursor; first and previous pages are
+    # addressed by number. The endpoint and shared query tail are encoded once.
+    endpoint = xml_text(feed.endpoint)
+    query = q(feed.parameters)
+    self_query = query
+    if feed.cursor:
+        self_query += q({"after": feed.cursor})
     parts = [
         feed.links,
-        get_start_link(config),
-        get_search_link(config),
-        nav_link("self", feed.endpoint, feed.page, feed.parameters, feed.kind),
-        nav_link("first", feed.endpoint, 1, feed.parameters, feed.kind),
+        get_start_link(config.opds_path()),
+        get_search_link(config.opds_path("opensearch.xml")),
+        nav_link("self", endpoint, feed.page, self_query, feed.kind),
+        nav_link("first", endpoint, 1, query, feed.kind),
     ]
     if feed.previous:
-        parts.append(
-            nav_link(
-                "previous", feed.endpoint, feed.page - 1, feed.parameters, feed.kind
-            )
-        )
-    if feed.next:
-        parts.append(
-            nav_link("next", feed.endpoint, feed.page + 1, feed.parameters, feed.kind)
-        )
+        parts.append(nav_link("previous", endpoint, feed.page - 1, query, feed.kind))
+    if feed.next_cursor:
+        next_query = query + q({"after": feed.next_cursor})
+        parts.append(nav_link("next", endpoint, feed.page + 1, next_query, feed.kind))
 
     return "\n".join(parts)
 
 
 def generate_feed(feed: Feed, config: Config) -> str:
-    entries = ""
+    # Navigation entries share the feed timestamp; format it only once.
+    feed_updated = fmt_dt(feed.updated_time)
+    parts = []
     for item in feed.items:
-        entries += f"""
+        if item.updated_time is feed.updated_time:
+            updated = feed_updated
+        else:
+            updated = fmt_dt(item.updated_time)
+        parts.append(f"""
         <entry>
             <title>{xml_text(item.title)}</title>
             <id>{xml_text(item.id)}</id>
             {get_author_xml(item.author, config)}
-            <updated>{fmt_dt(item.updated_time)}</updated>
+            <updated>{updated}</updated>
             {get_files_xml(item.db_id, item.files, config)}
             {item.links}
             <summary type="text">{xml_text(item.summary)}</summary>
         </entry>
-    """
+    """)
+    entries = "".join(parts)
 
     feed_xml = f"""<?xml version="1.0" encoding="utf-8"?>
     <feed xmlns="http://www.w3.org/2005/Atom">
         <title>{xml_text(feed.title)}</title>
         <id>{xml_text(feed.id)}</id>
-        <updated>{fmt_dt(feed.updated_time)}</updated>
+        <updated>{feed_updated}</updated>
         <author>
             <name>Calibre OPDS Server</name>
         </author>
@@ -184,47 +237,78 @@ def generate_feed(feed: Feed, config: Config) -> str:
     return feed_xml
 
 
-def generate_root_feed(config: Config) -> str:
+# Navigation entries of the root feed: title, id, link rel, path, kind, summary.
+ROOT_ENTRIES = (
+    (
+        "By Newest",
+        "urn:opds-server:by-newest:",
+        "http://opds-spec.org/sort/new",
+        "by-newest",
+        "acquisition",
+        "Books sorted by date",
+    ),
+    (
+        "By Title",
+        "urn:opds-server:by-title:",
+        "subsection",
+        "by-title",
+        "acquisition",
+        "Books sorted by title",
+    ),
+    (
+        "By Author",
+        "urn:opds-server:by-author:",
+        "subsection",
+        "by-author",
+        "navigation",
+        "Books sorted by author",
+    ),
+)
+
+
+# The root feed varies only by mount and timestamp. It is rendered once per
+# OPDS prefix around a placeholder timestamp, then split on that timestamp.
+ROOT_FEED_PLACEHOLDER = datetime(1, 1, 1, tzinfo=timezone.utc)
+_root_feeds: dict[str, list[str]] = {}
+
+
+def render_root_feed(config: Config, updated_time: datetime) -> str:
     feed = Feed(
         title="Calibre OPDS Catalog",
         id="urn:opds-server:main",
-        updated_time=datetime.now(timezone.utc),
+        updated_time=updated_time,
         endpoint=config.opds_path(),
         kind="navigation",
     )
 
-    items = [
-        Item(
-            title="By Newest",
-            id="urn:opds-server:by-newest:",
-            updated_time=feed.updated_time,
-            links=f'<link rel="http://opds-spec.org/sort/new" href="{xml_text(config.opds_path("by-newest"))}" type="application/atom+xml;profile=opds-catalog;kind=acquisition"/>',
-            summary="Books sorted by date",
-        ),
+    feed.items = [
         Item(
-            title="By Title",
-            id="urn:opds-server:by-title:",
+            title=title,
+            id=urn,
             updated_time=feed.updated_time,
-            links=f'<link rel="subsection" href="{xml_text(config.opds_path("by-title"))}" type="application/atom+xml;profile=opds-catalog;kind=acquisition"/>',
-            summary="Books sorted by title",
-        ),
-        Item(
-            title="By Author",
-            id="urn:opds-server:by-author:",
-            updated_time=feed.updated_time,
-            links=f'<link rel="subsection" href="{xml_text(config.opds_path("by-author"))}" type="application/atom+xml;profile=opds-catalog;kind=navigation"/>',
-            summary="Books sorted by author",
-        ),
+            links=f'<link rel="{rel}" href="{xml_text(config.opds_path(suffix))}" type="application/atom+xml;profile=opds-catalog;kind={kind}"/>',
+            summary=summary,
+        )
+        for title, urn, rel, suffix, kind, summary in ROOT_ENTRIES
     ]
 
-    feed.items = items
-
     return generate_feed(feed, config)
 
 
-async def generate_newest_feed(page: int, config: Config) -> str:
-    books, has_previous, has_next = await get_books(
-        sort="by_newest", page=page, config=config
+def generate_root_feed(config: Config) -> str:
+    parts = _root_feeds.get(config.opds_prefix)
+    if parts is None:
+        template = render_root_feed(config, ROOT_FEED_PLACEHOLDER)
+        parts = template.split(fmt_dt(ROOT_FEED_PLACEHOLDER))
+        _root_feeds[config.opds_prefix] = parts
+    return fmt_dt(utc_now()).join(parts)
+
+
+async def generate_newest_feed(
+    page: int, config: Config, after: str | None = None
+) -> str:
+    books, has_previous, next_cursor = await get_books(
+        sort="by_newest", page=page, config=config, after=after
     )
 
     items = items_from_books(books, config)
@@ -232,21 +316,24 @@ async def generate_newest_feed(page: int, config: Config) -> str:
     feed = Feed(
         title="Calibre OPDS Catalog",
         id="urn:opds-server:by-newest",
-        updated_time=datetime.now(timezone.utc),
+        updated_time=utc_now(),
         items=items,
         endpoint=config.opds_path("by-newest"),
         kind="acquisition",
         page=page,
-        next=has_next,
         previous=has_previous,
+        cursor=after,
+        next_cursor=next_cursor,
     )
 
     return generate_feed(feed, config)
 
 
-async def generate_title_feed(page: int, config: Config) -> str:
-    books, has_previous, has_next = await get_books(
-        sort="by_title", page=page, config=config
+async def generate_title_feed(
+    page: int, config: Config, after: str | None = None
+) -> str:
+    books, has_previous, next_cursor = await get_books(
+        sort="by_title", page=page, config=config, after=after
     )
 
     items = items_from_books(books, config)
@@ -254,23 +341,26 @@ async def generate_title_feed(page: int, config: Config) -> str:
     feed = Feed(
         title="Calibre OPDS Catalog",
         id="urn:opds-server:by-title",
-        updated_time=datetime.now(timezone.utc),
+        updated_time=utc_now(),
         items=items,
         endpoint=config.opds_path("by-title"),
         kind="acquisition",
         page=page,
-        next=has_next,
         previous=has_previous,
+        cursor=after,
+        next_cursor=next_cursor,
     )
 
     return generate_feed(feed, config)
 
 
-async def generate_by_author_feed(page: int, config: Config) -> str:
+async def generate_by_author_feed(
+    page: int, config: Config, after: str | None = None
+) -> str:
     """Generate an OPDS feed listing authors."""
-    authors, has_previous, has_next = await get_authors(page, config)
+    authors, has_previous, next_cursor = await get_authors(page, config, after)
 
-    updated_time = datetime.now(timezone.utc)
+    updated_time = utc_now()
 
     items: list[Item] = []
     for author_id, author_name in authors:
@@ -296,15 +386,18 @@ async def generate_by_author_feed(page: int, config: Config) -> str:
         kind="navigation",
         page=page,
         previous=has_previous,
-        next=has_next,
+        cursor=after,
+        next_cursor=next_cursor,
     )
 
     return generate_feed(feed_obj, config)
 
 
-async def generate_author_feed(author_id: int, page: int, config: Config) -> str:
-    books, has_previous, has_next = await get_author_books(
-        author_id, page=page, config=config
+async def generate_author_feed(
+    author_id: int, page: int, config: Config, after: str | None = None
+) -> str:
+    books, has_previous, next_cursor = await get_author_books(
+        author_id, page=page, config=config, after=after
     )
 
     items = items_from_books(books, config)
@@ -314,53 +407,59 @@ async def generate_author_feed(author_id: int, page: int, config: Config) -> str
     feed = Feed(
         title=f"Books by {author_name}",
         id=f"urn:opds-server:author:{author_id}",
-        updated_time=datetime.now(timezone.utc),
+        updated_time=utc_now(),
         items=items,
         endpoint=config.opds_path(f"author/{author_id}"),
         kind="acquisition",
         page=page,
-        next=has_next,
         previous=has_previous,
+        cursor=after,
+        next_cursor=next_cursor,
     )
     return generate_feed(feed, config)
 
 
-def items_from_books(books: dict[int, dict], config: Config) -> list[Item]:
+def items_from_books(books: Mapping[int, Mapping], config: Config) -> list[Item]:
     """Convert database records to entries, including incomplete metadata."""
-    items = []
-    for book_id, book in books.items():
-        items.append(
-            Item(
-                title=book["title"],
-                id=generate_book_id(str(book_id)),
-                db_id=book_id,
-                updated_time=book["last_modified"],
-                # Calibre libraries can contain books without an author link.
-                author=book["authors"][0] if book["authors"] else {},
-                files=book["files"],
-                links=f"""<link type="image/jpeg" href="{xml_text(config.opds_path(f"book/{book_id}/cover"))}" rel="http://opds-spec.org/image"/>""",
-            )
+    # Only the numeric id varies between cover links, so the escaped mount
+    # path is built once per page.
+    books_path = xml_text(config.opds_path("book"))
+    return [
+        Item(
+            title=book["title"],
+            id=generate_book_id(book_id),
+            db_id=book_id,
+            updated_time=parse_calibre_datetime(book["last_modified"]),
+            # Calibre libraries can contain books without an author link.
+            author=book["authors"][0] if book["authors"] else {},
+            files=book["files"],
+            links=f'<link type="image/jpeg" href="{books_path}/{book_id}/cover" rel="http://opds-spec.org/image"/>',
         )
-    return items
+        for book_id, book in books.items()
+    ]
 
 
-async def generate_book_search_feed(query: str, page: int, config: Config) -> str:
-    books, has_previous, has_next = await search_books(
+async def generate_book_search_feed(
+    query: str, page: int, config: Config, after: str | None = None
+) -> str:
+    books, has_previous, next_cursor = await search_books(
         query,
         page,
         config=config,
+        after=after,
     )
     items = items_from_books(books, config)
     feed = Feed(
         title=f"Search results for '{query}'",
         id=f"urn:opds-server:search:{query}",
-        updated_time=datetime.now(timezone.utc),
+        updated_time=utc_now(),
         items=items,
         endpoint=config.opds_path("search"),
         kind="acquisition",
         page=page,
-        next=has_next,
         previous=has_previous,
+        cursor=after,
+        next_cursor=next_cursor,
         parameters={"q": query},
     )
     return generate_feed(feed, config)
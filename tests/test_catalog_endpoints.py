@@ -1,16 +1,22 @@
 """Database-backed integration tests for the public OPDS and service
 endpoints."""
 
+import asyncio
+import base64
+import shutil
 import sqlite3
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta, timezone
 from urllib.parse import parse_qs, urlsplit
 from xml.etree import ElementTree
 
 import pytest
 from pydantic import ValidationError
 
+from opds_server.api.catalog import title_to_filename
 from opds_server.core.config import Config
+from opds_server.db import access
 from opds_server.db.access import parse_calibre_datetime
+from opds_server.services.opds import fmt_dt
 
 ATOM = "http://www.w3.org/2005/Atom"
 OPENSEARCH = "http://a9.com/-/spec/opensearch/1.1/"
@@ -85,6 +91,22 @@ def test_calibre_datetime_parsing_is_stable(value, expected):
     assert parse_calibre_datetime(value) == expected
 
 
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (datetime(2024, 1, 4, 12, 30, 5, 999, tzinfo=UTC), "2024-01-04T12:30:05Z"),
+        (
+            datetime(2024, 1, 4, 14, tzinfo=timezone(timedelta(hours=2))),
+            "2024-01-04T12:00:00Z",
+        ),
+        (datetime(101, 1, 1, tzinfo=UTC), "0101-01-01T00:00:00Z"),
+    ],
+)
+def test_atom_timestamps_are_utc_rfc3339(value, expected):
+    """Format UTC timestamps with four-digit years, such as Calibre's undefined date."""
+    assert fmt_dt(value) == expected
+
+
 @pytest.mark.parametrize("last_modified", [None, "", "not-a-date"])
 def test_books_with_invalid_dates_remain_in_feeds(catalog_client, last_modified):
     """Keep usable books visible when their Calibre timestamp is invalid."""
@@ -169,6 +191,262 @@ def test_offset_pagination_reads_live_changes_between_requests(client_factory):
     assert second_titles == ["A <Practical> Book", "Authorless"]
 
 
+def follow_next_links(client, endpoint: str, **params) -> list[str]:
+    """Collect entry titles from every page reached through next links."""
+    titles = []
+    response = client.get(endpoint, params=params)
+    while True:
+        feed = parse_atom(response)
+        titles.extend(
+            entry.findtext("atom:title", namespaces=NS) for entry in entries(feed)
+        )
+        next_links = links(feed, "next")
+        if not next_links:
+            return titles
+        response = client.get(next_links[0].get("href"))
+
+
+def test_next_links_seek_past_live_changes_between_requests(client_factory):
+    """Continue after the last received book when earlier books are added."""
+    library, client = client_factory(page_size=2)
+    first = parse_atom(client.get("/opds/by-title"))
+    next_href = links(first, "next")[0].get("href")
+    query = parse_qs(urlsplit(next_href).query)
+    assert query["page"] == ["2"] and query["after"]
+
+    with sqlite3.connect(library / "metadata.db") as connection:
+        connection.execute(
+            """
+            INSERT INTO books (id, title, sort, last_modified, path)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (5, "New First Book", "000 First", "2024-01-05 12:00:00+00:00", "New"),
+        )
+
+    second = parse_atom(client.get(next_href))
+    assert [
+        entry.findtext("atom:title", namespaces=NS) for entry in entries(second)
+    ] == [
+        "Authorless",
+        "Under_score",
+    ]
+    assert links(second, "previous") and not links(second, "next")
+    self_query = parse_qs(urlsplit(links(second, "self")[0].get("href")).query)
+    assert self_query["after"] == query["after"]
+
+
+def test_next_links_traverse_null_and_duplicate_sort_keys(client_factory):
+    """Visit every book once when sort keys are missing or shared."""
+    library, client = client_factory(page_size=1)
+    with sqlite3.connect(library / "metadata.db") as connection:
+        connection.execute("UPDATE books SET last_modified = NULL WHERE id IN (2, 4)")
+        connection.execute("UPDATE books SET sort = 'Shared'")
+
+    assert follow_next_links(client, "/opds/by-newest") == [
+        "100% Unicode книга",
+        "Authorless",
+        "Under_score",
+        "A <Practical> Book",
+    ]
+    assert follow_next_links(client, "/opds/by-title") == [
+        "A <Practical> Book",
+        "100% Unicode книга",
+        "Under_score",
+        "Authorless",
+    ]
+    assert follow_next_links(client, "/opds/search", q="o") == [
+        "A <Practical> Book",
+        "100% Unicode книга",
+        "Under_score",
+        "Authorless",
+    ]
+    assert follow_next_links(client, "/opds/author/2") == [
+        "A <Practical> Book",
+        "100% Unicode книга",
+    ]
+
+
+def test_next_links_traverse_authors(client_factory):
+    """Page through the author list with cursors."""
+    _, client = client_factory(page_size=1)
+    assert follow_next_links(client, "/opds/by-author") == ["Ada & Sons", "Zoë Автор"]
+
+
+def encode_cursor(payload: str) -> str:
+    """Encode a raw JSON payload the way page cursors are encoded."""
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-base64!",
+        "bnVsbA",
+        "WyJhIiwgImIiXQ",
+        encode_cursor(f'["a", {10**30}]'),
+        encode_cursor(f"[{10**30}, 1]"),
+        encode_cursor(f"[{-(2**63) - 1}, 1]"),
+        encode_cursor("[1e400, 1]"),
+        encode_cursor("[NaN, 1]"),
+    ],
+)
+def test_invalid_page_cursor_is_rejected(catalog_client, cursor):
+    """Reject cursors that were not produced by the catalog."""
+    _, client = catalog_client
+    response = client.get("/opds/by-title", params={"page": 2, "after": cursor})
+    assert (response.status_code, response.text) == (400, "Invalid page cursor")
+
+
+def test_replaced_database_is_read_after_connection_reuse(catalog_client):
+    """Reopen metadata.db when Calibre replaces the file between requests."""
+    library, client = catalog_client
+    assert len(entries(parse_atom(client.get("/opds/by-title")))) == 2
+
+    replacement = library / "replacement.db"
+    shutil.copyfile(library / "metadata.db", replacement)
+    with sqlite3.connect(replacement) as connection:
+        connection.execute("DELETE FROM books WHERE id != 4")
+    connection.close()
+    replacement.replace(library / "metadata.db")
+
+    feed = parse_atom(client.get("/opds/by-title"))
+    assert [entry.findtext("atom:title", namespaces=NS) for entry in entries(feed)] == [
+        "Authorless"
+    ]
+
+
+def test_author_and_file_changes_are_read_after_prefetch(catalog_client):
+    """Reload prefetched authors and files after Calibre commits changes."""
+    library, client = catalog_client
+
+    def authorless_entry() -> ElementTree.Element:
+        """Return the entry of the initially authorless book."""
+        feed = parse_atom(client.get("/opds/search", params={"q": "Authorless"}))
+        return entries(feed)[0]
+
+    entry = authorless_entry()
+    assert entry.find("atom:author", NS) is None
+    assert not links(entry, "http://opds-spec.org/acquisition")
+
+    with sqlite3.connect(library / "metadata.db") as connection:
+        connection.execute("INSERT INTO books_authors_link VALUES (4, 1)")
+        connection.execute("INSERT INTO data VALUES (4, 'EPUB', 'Authorless')")
+
+    entry = authorless_entry()
+    assert entry.findtext("atom:author/atom:name", namespaces=NS) == "Ada & Sons"
+    assert [
+        link.get("href") for link in links(entry, "http://opds-spec.org/acquisition")
+    ] == ["/opds/book/4/file/epub"]
+
+
+def test_concurrent_requests_share_one_prefetch_after_a_commit(
+    catalog_client, monkeypatch
+):
+    """Reload the link tables once per commit, from any event loop."""
+    library, _ = catalog_client
+    config = Config(calibre_library_path=library)
+    loads = []
+    load_book_links = access._load_book_links
+
+    async def counting_load(conn):
+        """Record every full reload of the link tables."""
+        loads.append(conn)
+        return await load_book_links(conn)
+
+    monkeypatch.setattr(access, "_load_book_links", counting_load)
+
+    async def prefetch_concurrently() -> None:
+        """Prefetch from several requests at once, as after a commit."""
+        async with access.connect_db(config) as conn:
+            results = await asyncio.gather(
+                *(access.prefetch_book_links(conn) for _ in range(5))
+            )
+        assert all(result is results[0] for result in results)
+
+    # The cached connection outlives each event loop, as it does across apps.
+    for title in ("Renamed", "Renamed again"):
+        with sqlite3.connect(library / "metadata.db") as connection:
+            connection.execute("UPDATE books SET title = ? WHERE id = 1", (title,))
+        asyncio.run(prefetch_concurrently())
+    asyncio.run(access.close_connections())
+
+    assert len(loads) == 2
+
+
+def test_repeated_book_pages_are_cached_until_the_library_changes(
+    catalog_client, monkeypatch
+):
+    """Serve repeated searches from memory and query again after a commit."""
+    library, client = catalog_client
+    queries = []
+    fetch_page = access.fetch_page
+
+    async def counting_fetch_page(*args, **kwargs):
+        """Record every page query that reaches the database."""
+        queries.append(args[2])
+        return await fetch_page(*args, **kwargs)
+
+    monkeypatch.setattr(access, "fetch_page", counting_fetch_page)
+
+    def titles() -> list[str]:
+        """Return the entry titles of a repeated search."""
+        feed = parse_atom(client.get("/opds/search", params={"q": "book"}))
+        return [entry.findtext("atom:title", namespaces=NS) for entry in entries(feed)]
+
+    assert titles() == titles() == ["A <Practical> Book"]
+    assert len(queries) == 1
+
+    with sqlite3.connect(library / "metadata.db") as connection:
+        connection.execute("UPDATE books SET title = 'Renamed book' WHERE id = 1")
+
+    assert titles() == ["Renamed book"]
+    assert len(queries) == 2
+
+
+def test_cached_book_pages_cannot_be_mutated(catalog_client):
+    """Keep a caller's changes to a page out of later cached responses."""
+    library, _ = catalog_client
+    config = Config(calibre_library_path=library)
+
+    async def first_book() -> dict:
+        """Return the first book of the cached title page."""
+        books, _, _ = await access.get_books("by_title", 1, config)
+        return books[2]
+
+    book = asyncio.run(first_book())
+    with pytest.raises(TypeError):
+        book["title"] = "Changed"
+    with pytest.raises(TypeError):
+        book["authors"][0]["name"] = "Changed"
+    with pytest.raises(AttributeError):
+        book["files"].append({"format": "PDF", "name": "Changed"})
+
+    book = asyncio.run(first_book())
+    asyncio.run(access.close_connections())
+    assert book["title"] == "100% Unicode книга"
+    assert [author["name"] for author in book["authors"]] == ["Zoë Автор"]
+    assert [file["format"] for file in book["files"]] == ["EPUB"]
+
+
+@pytest.mark.parametrize(
+    "endpoint", ["/opds/by-title", "/opds/by-newest", "/opds/author/2"]
+)
+def test_large_libraries_query_authors_and_files_per_page(
+    client_factory, monkeypatch, endpoint
+):
+    """Render the same entries when a library is too large to prefetch."""
+    _, client = client_factory(page_size=10)
+    prefetched = client.get(endpoint).text
+    monkeypatch.setattr(access, "PREFETCH_MAX_BOOKS", 0)
+    _, client = client_factory(page_size=10)
+
+    def without_updated(xml: str) -> list[str]:
+        """Drop lines containing the per-request feed timestamp."""
+        return [line for line in xml.splitlines() if "<updated>" not in line]
+
+    assert without_updated(client.get(endpoint).text) == without_updated(prefetched)
+
+
 def test_catalog_ordering_uses_calibre_sort_fields_and_id_tie_breakers(
     client_factory,
 ):
@@ -268,6 +546,22 @@ def test_empty_catalog_returns_valid_empty_feeds(client_factory):
         assert not entries(parse_atom(client.get(endpoint)))
 
 
+@pytest.mark.parametrize(
+    ("title", "expected"),
+    [
+        ("A <Practical> Book", "A _Practical_ Book.epub"),
+        ('Path/To\\Book: "Why?" *|', "Path_To_Book_ _Why__ __.epub"),
+        ("  Spaced \t\n  Out.  ", "Spaced Out.epub"),
+        ("...", "book.epub"),
+        ("\ufb01ve Café", "five Cafe\u0301.epub"),
+        ("x" * 150, f"{'x' * 100}.epub"),
+    ],
+)
+def test_download_filenames_are_sanitized(title, expected):
+    """Replace reserved characters and collapse whitespace in filenames."""
+    assert title_to_filename(title, extension="epub") == expected
+
+
 def test_download_and_cover_responses(catalog_client):
     """Serve known files with correct types and stable not-found responses."""
     _, client = catalog_client
@@ -278,6 +572,9 @@ def test_download_and_cover_responses(catalog_client):
         b"epub contents",
         "application/epub+zip",
     )
+    assert book.headers["content-disposition"] == (
+        "attachment; filename*=utf-8''A%20_Practical_%20Book.epub"
+    )
     assert (cover.status_code, cover.content, cover.headers["content-type"]) == (
         200,
         b"jpeg contents",
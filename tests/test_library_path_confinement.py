@@ -1,5 +1,6 @@
 """Integration tests for confining Calibre-controlled filesystem paths."""
 
+import asyncio
 import logging
 import sqlite3
 from pathlib import Path
@@ -11,6 +12,7 @@ from fastapi.testclient import TestClient
 from pydantic import ValidationError
 
 from opds_server.core.config import Config
+from opds_server.db import access
 from opds_server.db.access import get_db_path
 from opds_server.main import create_app
 
@@ -166,7 +168,7 @@ def test_locked_database_returns_stable_unavailable_response(
     library.mkdir()
     sqlite3.connect(library / "metadata.db").close()
 
-    async def locked_connect(*args, **kwargs):
+    def locked_connect(*args, **kwargs):
         raise aiosqlite.OperationalError("database is locked")
 
     monkeypatch.setattr(aiosqlite, "connect", locked_connect)
@@ -213,6 +215,92 @@ def test_readiness_recovers_without_restarting(
         )
 
 
+def test_readiness_probes_reuse_one_connection(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """Answer repeated readiness probes without reopening metadata.db."""
+    library = tmp_path / "library"
+    library.mkdir()
+    sqlite3.connect(library / "metadata.db").close()
+    opened = []
+    connect = aiosqlite.connect
+
+    def counting_connect(*args, **kwargs):
+        opened.append(args[0])
+        return connect(*args, **kwargs)
+
+    monkeypatch.setattr(aiosqlite, "connect", counting_connect)
+    client = make_client(library)
+
+    for _ in range(3):
+        response = client.get("/ready")
+        assert (response.status_code, response.text) == (200, "ok")
+    assert len(opened) == 1
+
+
+def test_closed_shared_connection_is_reopened(tmp_path: Path):
+    """Reopen the cached connection after it was closed underneath the cache."""
+    library = tmp_path / "library"
+    library.mkdir()
+    sqlite3.connect(library / "metadata.db").close()
+    client = make_client(library)
+    assert client.get("/ready").status_code == 200
+
+    db_path = get_db_path(Config(calibre_library_path=library))
+    closed = access._connections[db_path].conn
+    asyncio.run(closed.close())
+
+    response = client.get("/ready")
+    assert (response.status_code, response.text) == (200, "ok")
+    assert access._connections[db_path].conn is not closed
+
+
+@pytest.mark.parametrize(
+    ("error_code", "reopened"),
+    [(sqlite3.SQLITE_BUSY, False), (sqlite3.SQLITE_CORRUPT, True)],
+)
+def test_failed_request_does_not_close_connection_in_use(
+    tmp_path: Path, error_code: int, reopened: bool
+):
+    """Let concurrent requests finish when another request's query fails."""
+    library = tmp_path / "library"
+    library.mkdir()
+    sqlite3.connect(library / "metadata.db").close()
+    config = Config(calibre_library_path=library)
+
+    async def failing_request() -> None:
+        async with access.connect_db(config):
+            error = aiosqlite.OperationalError("query failed")
+            error.sqlite_errorcode = error_code
+            raise error
+
+    async def slow_request(started: asyncio.Event, failed: asyncio.Event) -> int:
+        async with access.connect_db(config) as conn:
+            started.set()
+            await failed.wait()
+            async with conn.execute("SELECT 1") as cursor:
+                (value,) = await cursor.fetchone()
+            return value
+
+    async def run() -> tuple[list, bool]:
+        started, failed = asyncio.Event(), asyncio.Event()
+        slow = asyncio.create_task(slow_request(started, failed))
+        await started.wait()
+        first = access._connections[get_db_path(config)]
+        try:
+            await failing_request()
+        except HTTPException as exc:
+            failure = exc.status_code
+        failed.set()
+        results = [failure, await slow]
+        async with access.connect_db(config):
+            current = access._connections[get_db_path(config)]
+        await access.close_connections()
+        return results, current is not first
+
+    assert asyncio.run(run()) == ([503, 1], reopened)
+
+
 def test_missing_absolute_library_is_valid_configuration(tmp_path: Path):
     """Allow an absolute library path to be mounted after configuration."""
     config = Config(calibre_library_path=tmp_path / "not-mounted")